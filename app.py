@@ -1,11 +1,16 @@
 import dash
-from dash import dcc, html
+from dash import Patch, ctx, dcc, html
 import pandas as pd
+import numpy as np
 from dash.dependencies import Input, Output, State
 import plotly.express as px
 from datetime import datetime as dt
 from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
+from functools import lru_cache
+from copy import deepcopy
+import json
+import os
 
 # Initialize the Dash app
 app = dash.Dash(__name__, meta_tags=[{"name": "viewport", "content": "width=device-width"}])
@@ -15,70 +20,181 @@ server = app.server
 # ------------------------------------------------------------------------------
 # Load & Preprocess Data
 # ------------------------------------------------------------------------------
-df = pd.read_csv("shark.csv")  # <-- Adjust CSV path if needed
-
-df["Latitude"] = pd.to_numeric(df["Latitude"], errors="coerce")
-df["Longitude"] = pd.to_numeric(df["Longitude"], errors="coerce")
-df.dropna(subset=["Latitude", "Longitude"], inplace=True)
-
-df["Latitude"] = df["Latitude"].round(5)
-df["Longitude"] = df["Longitude"].round(5)
+DATA_PATH = "shark.csv"  # <-- Adjust CSV path if needed
+CACHE_PATH = "shark.pkl"  # Preprocessed copy of DATA_PATH, rebuilt when it is outdated
+
+# Canonical spelling of the Victim.injury values, keyed by their stripped lowercase form
+# ("unknown" has no severity, so like any other unmapped value its rows are dropped)
+injury_labels = {
+    "uninjured": "uninjured",
+    "injured": "injured",
+    "injury": "injured",
+    "fatal": "fatal",
+}
 
-# Reconstruct 'Date' column from year-month data
-df["Date"] = pd.to_datetime(
-    df["Incident.year"].astype(str) + "-" + df["Incident.month"].astype(str),
-    errors="coerce"
+# Numeric measurement columns, coerced to numbers and downcast to float32 where lossless
+# (Latitude/Longitude stay float64: map clicks are matched on their exact rounded values)
+numeric_columns = (
+    "Shark.length.m",
+    "Depth.of.incident.m",
+    "Distance.to.shore.m",
+    "Water.visability.m",
+    "Air.temperature.°C",
+    "Total.water.depth.m",
+    "Time.in.water.min",
+    "Victim.age",
 )
 
-# New columns for better filtering and grouping
-df["Month"] = df["Date"].dt.month_name()
-df["DayOfWeek"] = df["Date"].dt.day_name()
-
-# Sorting 'Date' values
-df = df.sort_values("Date")
-
-# Store unique dates and create mappings to indices
-unique_dates = df["Date"].dropna().unique()
-date_to_index = {date: i for i, date in enumerate(unique_dates)}
-index_to_date = {i: date for i, date in enumerate(unique_dates)}
-
-# Convert 'Site.category' to title case
-df["Site.category"] = df["Site.category"].str.title()
+# Raw columns of DATA_PATH that the app uses; the other columns are not parsed at all
+raw_columns = (
+    "Incident.year",
+    "Incident.month",
+    "State",
+    "Latitude",
+    "Longitude",
+    "Site.category",
+    "Shark.common.name",
+    "Provoked/unprovoked",
+    "Victim.injury",
+    "Victim.activity",
+    *numeric_columns,
+)
 
-# Create numeric codes for Victim.injury
-# eplacing values in Victim.injury column where it is needed
-df["Victim.injury"] = df["Victim.injury"].str.replace(r"(Injured|injury)", "injured", case=False, regex=True)
-# Drop the unkown category
-df = df[df["Victim.injury"] != "unknown"]
-# Custom mapping for injury type
+# Custom mapping for injury type (listed in severity order)
 injury_map = {
     "uninjured": 0,
     "injured": 1,
     "fatal": 2
 }
-df["Victim.injury.num"] = df["Victim.injury"].map(injury_map)
-# Replacing values in 'Victim.activity' column where it is needed
-df['Victim.activity'] = df['Victim.activity'].str.replace("snorkeling", "snorkelling")
-df['Victim.activity'] = df['Victim.activity'].str.replace("diving, collecting", "diving")
-
-# Convert certain columns to numeric, ignoring errors
-df["Shark.length.m"] = pd.to_numeric(df.get("Shark.length.m"), errors="coerce")
-df["Depth.of.incident.m"] = pd.to_numeric(df.get("Depth.of.incident.m"), errors="coerce")
-df["Distance.to.shore.m"] = pd.to_numeric(df.get("Distance.to.shore.m"), errors="coerce")
-df["Water.visability.m"] = pd.to_numeric(df.get("Water.visability.m"), errors="coerce")
-df["Air.temperature.°C"] = pd.to_numeric(df.get("Air.temperature.°C"), errors="coerce")
-df["Total.water.depth.m"] = pd.to_numeric(df.get("Total.water.depth.m"), errors="coerce")
-df["Time.in.water.min"] = pd.to_numeric(df.get("Time.in.water.min"), errors="coerce")
-
-# Convert victim age to numeric
-df["Victim.age"] = pd.to_numeric(df.get("Victim.age"), errors="coerce")
 
 # Define bins and labels for Victim.age grouping
 age_bins = [0, 4, 8, 12, 16, 20, 24, 28, 32, 36, 40, 44, 48, 52, 56, 60, 64, 68, 72, 76, 80, 84, 88, 92, 96, 100]
 age_labels = [f"{age}-{age+3}" for age in age_bins[:-1]]
 
-# Create a new column for age group
-df["Victim.age.group"] = pd.cut(df["Victim.age"], bins=age_bins, labels=age_labels, right=False)
+
+def build_dataframe():
+    """
+    Reads the raw CSV file and applies all preprocessing steps
+    (coordinates, dates, category clean-up, numeric conversions and age groups).
+
+    :return: The preprocessed DataFrame, sorted by 'Date'.
+    """
+    # Copy-on-Write for the preprocessing only: the frames derived in these steps share
+    # their data with the parent until one of them is written to
+    with pd.option_context("mode.copy_on_write", True):
+        df = pd.read_csv(DATA_PATH, usecols=lambda column: column in raw_columns)
+
+        # Coerce the raw columns in one assign: malformed measurements become NaN instead
+        # of failing the whole load, and Victim.injury spellings are normalized (case and
+        # surrounding whitespace first, then a single dictionary lookup)
+        injury_spelling = df["Victim.injury"].str.strip().str.lower()
+        df = df.assign(**{
+            **{col: pd.to_numeric(df.get(col), errors="coerce", downcast="float") for col in numeric_columns},
+            "Latitude": pd.to_numeric(df["Latitude"], errors="coerce"),
+            "Longitude": pd.to_numeric(df["Longitude"], errors="coerce"),
+            "Victim.injury": injury_spelling.map(injury_labels),
+        })
+
+        # Keep the rows with valid coordinates and a known or missing injury (dropping the
+        # unknown category), selecting them with one combined mask in a single pass
+        keep = (
+            df["Latitude"].notna() & df["Longitude"].notna()
+            & (df["Victim.injury"].notna() | injury_spelling.isna())
+        )
+        df = df.loc[keep].reset_index(drop=True)
+
+        # Reconstruct 'Date' column from year-month data (assembled from the numeric components)
+        date = pd.to_datetime(
+            dict(year=df["Incident.year"], month=df["Incident.month"], day=1),
+            errors="coerce"
+        )
+
+        df = df.assign(
+            # Round with NumPy directly on the underlying arrays
+            Latitude=np.round(df["Latitude"].to_numpy(), 5),
+            Longitude=np.round(df["Longitude"].to_numpy(), 5),
+            Date=date,
+            # New columns for better filtering and grouping
+            Month=date.dt.month_name(),
+            DayOfWeek=date.dt.day_name(),
+            # Date as displayed in the incident modal, formatted once for all rows
+            DateStr=date.dt.strftime("%Y-%m-%d").fillna("Unknown"),
+        )
+
+        # Sorting 'Date' values (stable, with a fresh contiguous index)
+        df = df.sort_values("Date", kind="stable", ignore_index=True)
+
+        # Victim.injury as an ordered categorical in severity order, whose codes are the injury_map values
+        injury = pd.Categorical(df["Victim.injury"], categories=list(injury_map), ordered=True)
+
+        # Create a new column for age group
+        # np.digitize finds the bin of every age in one pass; missing ages and ages
+        # outside [0, 100) get code -1, which the Categorical treats as no group
+        age_codes = np.digitize(df["Victim.age"].to_numpy(), age_bins, right=False) - 1
+        age_codes[(age_codes < 0) | (age_codes >= len(age_labels))] = -1
+
+        df = df.assign(**{
+            # Convert 'Site.category' to title case, once per category instead of once per row
+            # (spellings that only differ in case become the same value)
+            "Site.category": df["Site.category"].astype("category").map(str.title, na_action="ignore"),
+            "Victim.injury": injury,
+            # Create numeric codes for Victim.injury (NaN where the injury is missing)
+            "Victim.injury.num": np.where(injury.codes >= 0, injury.codes, np.nan).astype("float32"),
+            # Replacing values in 'Victim.activity' column where it is needed
+            "Victim.activity": df["Victim.activity"].replace(
+                {"snorkeling": "snorkelling", "diving, collecting": "diving"}
+            ),
+            "Victim.age.group": pd.Categorical.from_codes(age_codes.astype("int8"), categories=age_labels),
+        })
+
+        # Store the text columns used by the filter dropdowns and histogram bins as categoricals
+        return df.astype({
+            col: "category"
+            for col in (
+                "State", "Shark.common.name", "Provoked/unprovoked",
+                "Month", "DayOfWeek", "Victim.activity", "Site.category",
+            )
+        })
+
+
+def load_dataframe():
+    """
+    Loads the preprocessed dataset from CACHE_PATH, so that restarts and dev-reloads
+    skip the CSV parsing and preprocessing. The cache is rebuilt when the CSV or this
+    file is newer than it, or when it cannot be read.
+
+    :return: The preprocessed DataFrame.
+    """
+    source_mtime = max(os.path.getmtime(DATA_PATH), os.path.getmtime(__file__))
+    if os.path.exists(CACHE_PATH) and os.path.getmtime(CACHE_PATH) >= source_mtime:
+        try:
+            return pd.read_pickle(CACHE_PATH)
+        except Exception:
+            pass  # Unreadable cache (e.g. written by another pandas version): rebuild it
+
+    data = build_dataframe()
+    try:
+        data.to_pickle(CACHE_PATH)
+    except OSError:
+        pass  # Read-only deployment: keep running without the cache
+    return data
+
+
+df = load_dataframe()
+
+# Store the sorted unique dates; slider positions index into them
+# and dates are mapped back to positions with a binary search
+unique_dates = pd.DatetimeIndex(df["Date"].dropna().drop_duplicates().to_numpy())
+index_to_date = unique_dates
+# The same dates as int64 day numbers (the dates are day precision), searched with plain NumPy
+unique_days = unique_dates.to_numpy().astype("datetime64[D]").view("int64")
+
+# Year labels for every 50th slider position, taken from the DatetimeIndex in one pass
+mark_positions = np.arange(0, len(unique_dates), 50)
+slider_marks = {
+    int(i): str(year)
+    for i, year in zip(mark_positions, unique_dates.year[mark_positions])
+}
 
 # Define custom sorting orders for months, days, and age bins
 custom_month_order = [
@@ -90,32 +206,86 @@ custom_day_order = [
     "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 ]
 
-custom_age_order = age_labels + ["Unknown"]
+# Prepare dropdown options for filters (read from the categories of the filter columns)
+months_present = set(df["Month"].cat.categories)
+days_present = set(df["DayOfWeek"].cat.categories)
 
-# Prepare dropdown options for filters
 state_options = [
     {"label": st, "value": st}
-    for st in sorted(df["State"].dropna().unique())
+    for st in df["State"].cat.categories
 ]
 species_options = [
     {"label": s, "value": s}
-    for s in df["Shark.common.name"].dropna().unique()
+    for s in df["Shark.common.name"].cat.categories
 ]
 month_options = [
     {"label": m, "value": m}
     for m in custom_month_order
-    if m in df["Month"].dropna().unique()
+    if m in months_present
 ]
 dayofweek_options = [
     {"label": d, "value": d}
     for d in custom_day_order
-    if d in df["DayOfWeek"].dropna().unique()
+    if d in days_present
 ]
 victim_activity_options = [
     {"label": act, "value": act}
-    for act in df["Victim.activity"].dropna().unique()
+    for act in df["Victim.activity"].cat.categories
 ]
 
+# Numeric columns for the PCP (float32 since loading), and the rows with a value in all of them
+pcp_columns = [
+    "Distance.to.shore.m",
+    "Depth.of.incident.m",
+    "Total.water.depth.m",
+    "Time.in.water.min"
+]
+pcp_complete_rows = df[pcp_columns].notna().all(axis=1).to_numpy()
+
+# Column behind every histogram type (the values of its bins are the column's categories)
+histogram_columns = {
+    "age": "Victim.age.group",
+    "state": "State",
+    "month": "Month",
+    "dayofweek": "DayOfWeek",
+    "sitecategory": "Site.category",
+    "activity": "Victim.activity",
+}
+
+# Category codes of the categorical filter columns, so that filters compare small
+# integers instead of hashing strings (-1 marks a missing value)
+category_codes = {
+    col: df[col].cat.codes.to_numpy()
+    for col in ("Shark.common.name", "Provoked/unprovoked", *histogram_columns.values())
+}
+
+# The species with the most incidents overall each get a bar in the stacked bar chart
+# (in this order, so bars keep their place between filters); the rest are "Other"
+max_bars = 10
+top_species = df["Shark.common.name"].value_counts().head(max_bars).index.tolist()
+bar_labels = np.array(top_species + ["Other"], dtype=object)
+# Bar of every species code: its position in top_species, or the "Other" bar
+species_bar_codes = np.full(len(df["Shark.common.name"].cat.categories), len(top_species), dtype=np.intp)
+species_bar_codes[df["Shark.common.name"].cat.categories.get_indexer(top_species)] = np.arange(len(top_species))
+
+# Species and provoked/unprovoked status of every row packed into a single code,
+# (species code + 1) * provoked_base + (provoked code + 1), so that the stacked bar
+# selection and counts read one small array instead of two (a part of 0 is a missing value)
+provoked_base = len(df["Provoked/unprovoked"].cat.categories) + 1
+species_provoked_codes = (
+    (category_codes["Shark.common.name"].astype(np.int32) + 1) * provoked_base
+    + category_codes["Provoked/unprovoked"] + 1
+).astype(np.uint16)
+# Bar/status slot of the stacked bar counts for every packed code (-1 if a part is missing)
+packed_species, packed_provoked = np.divmod(
+    np.arange((len(species_bar_codes) + 1) * provoked_base), provoked_base
+)
+packed_bar_codes = np.where(
+    (packed_species > 0) & (packed_provoked > 0),
+    species_bar_codes[packed_species - 1] * (provoked_base - 1) + packed_provoked - 1,
+    -1,
+)
+
 # Maping shark species to corresponding images
 species_image_map = {
     "grey reef shark": "gray-reef-shark.webp",
@@ -143,7 +313,10 @@ species_image_map = {
     "sevengill shark": "sevengill-shark.jpg",
     "lemon shark": "lemon-shark.jpg",
 }
+# Normalize the keys once so that lookups only need to normalize the species name
+species_image_map = {k.strip().lower(): v for k, v in species_image_map.items()}
 
+@lru_cache(maxsize=256)
 def get_shark_image(species_name: str) -> str:
     """
     Returns the corresponding shark image filename based on the species name.
@@ -156,6 +329,19 @@ def get_shark_image(species_name: str) -> str:
     clean = species_name.strip().lower()
     return species_image_map.get(clean, "unknown.webp")
 
+# Image of every species in the data, looked up once instead of per incident
+shark_images = {species: get_shark_image(species) for species in df["Shark.common.name"].cat.categories}
+
+def get_shark_images(species_names: pd.Series) -> pd.Series:
+    """
+    Vectorized version of get_shark_image for a whole column of species names.
+    :param species_names: a Series of species names from df["Shark.common.name"]
+    :return: A Series with the image filename of every species, 'unknown.webp' if not recognized.
+    """
+    # Mapping a categorical maps its categories; the result is categorical when the
+    # images happen to be unique, so it is made plain before filling the gaps
+    return species_names.map(shark_images).astype(object).fillna("unknown.webp")
+
 # Define colorblind-friendly and default palettes
 CB_COLOR_CYCLE = [
     '#0072B2','#F0E442', '#D55E00',
@@ -175,384 +361,442 @@ def get_color_discrete_sequence(colorblind_active):
     """
     return CB_COLOR_CYCLE if colorblind_active else DEFAULT_COLOR_CYCLE
 
+# Figures that do not depend on the data, built once instead of in every callback
+NO_DATA_PCP_FIGURE = px.scatter(title="No Data in PCP").to_dict()
+NO_ROWS_PCP_FIGURE = px.scatter(title="No Data for PCP").to_dict()
+INVALID_HISTOGRAM_FIGURE = px.scatter(title="Invalid Histogram Type").to_dict()
+
+def get_filter_spec(
+    slider_range, selected_states, selected_species, selected_months,
+    selected_dows, selected_activities, selected_bins, selected_coords=None
+):
+    """
+    Builds the canonical filter specification that is kept in 'filtered-data-store'.
+    It is a small JSON string instead of the filtered rows themselves; every callback
+    (on any server worker) resolves it to the rows with get_filtered_rows.
+
+    :param slider_range: The [start_idx, end_idx] positions of the date slider.
+    :param selected_states: The selected states (or None).
+    :param selected_species: The selected shark species (or None).
+    :param selected_months: The selected month names (or None).
+    :param selected_dows: The selected days of the week (or None).
+    :param selected_activities: The selected victim activities (or None).
+    :param selected_bins: The histogram bin selection, e.g. {"hist_type": "age", "values": [...]}.
+    :param selected_coords: The (lat, lon) pairs of a map selection (or None).
+    :return: A JSON string that is identical for identical filters.
+    """
+    def canonical(values):
+        return sorted(values) if values else None
+
+    hist_type = selected_bins["hist_type"] if selected_bins else None
+    bin_list = canonical(selected_bins["values"]) if selected_bins else None
+    spec = {
+        "dates": list(slider_range) if slider_range else None,
+        "states": canonical(selected_states),
+        "species": canonical(selected_species),
+        "months": canonical(selected_months),
+        "dows": canonical(selected_dows),
+        "activities": canonical(selected_activities),
+        "bins": {"hist_type": hist_type, "values": bin_list} if hist_type and bin_list else None,
+        "coords": canonical(selected_coords),
+    }
+    return json.dumps(spec, sort_keys=True, separators=(",", ":"))
+
+
+# Filter specification of the unfiltered dataset (the initial state of the filter inputs)
+default_filter_spec = get_filter_spec(
+    [0, len(unique_dates) - 1], None, None, None, None, None, {"hist_type": "age", "values": []}
+)
+
 # ------------------------------------------------------------------------------
 # App Layout
 # ------------------------------------------------------------------------------
-app.layout = html.Div(style={"position": "relative"}, children=[
-
-    # (1) Button & Store for toggling colorblind mode
-    html.Div(
-        [
-            html.Button(
-                "Toggle Colorblind Mode",
-                id="toggle-colorblind-button",
-                n_clicks=0,
-                style={
-                    "zIndex": 9999
-                }
-            ),
-            html.Button(
-                "Help",
-                id="help-button",
-                n_clicks=0,
-                style={
-                    "zIndex": 9999
-                }
-            )
-        ],
-        style={
-            "position": "absolute",
-            "top": "10px",
-            "left": "10px",
-            "display": "flex",
-            "alignItems": "center"
-        }
-    ),
+# Modal to display detailed incident info (static, so it is built only once)
+INFO_MODAL = html.Div(
+    id="info-modal",
+    style={
+        "display": "none",
+        "position": "fixed",
+        "top": "20%",
+        "left": "30%",
+        "width": "40%",
+        "height": "auto",
+        "backgroundColor": "white",
+        "boxShadow": "0px 0px 10px rgba(0, 0, 0, 0.5)",
+        "zIndex": 1000,
+        "padding": "20px",
+        "borderRadius": "10px",
+    },
+    children=[
+        html.Button("Close", id="close-modal", style={"float": "right", "margin": "10px"}),
+        html.Div(
+            style={"marginBottom": "10px", "textAlign": "center"},
+            children=[
+                html.Button(
+                    "Previous",
+                    id="prev-incident",
+                    n_clicks=0,
+                    style={"marginRight": "20px", "padding": "8px 16px"}
+                ),
+                html.Button(
+                    "Next",
+                    id="next-incident",
+                    n_clicks=0,
+                    style={"padding": "8px 16px"}
+                ),
+            ],
+        ),
+        html.Div(id="modal-incident-content"),
+    ],
+)
 
-    html.Div(
-        id="background-container",
-        children=[
-            html.Div(
-                className="row",
-                children=[
-                    # Left Column (Controls + Third Chart)
-                    html.Div(
-                        className="four columns div-user-controls",
-                        children=[
-                            html.H2("SharkWatch: Shark Incidents in Australia"),
-
-                            # Date Range (RangeSlider + inputs)
-                            html.P("Select a date range to filter incidents."),
-                            html.Div([
-                                html.Label("Start Date:"),
-                                dcc.Input(
-                                    id="start-date-input",
-                                    type="text",
-                                    placeholder="YYYY-MM-DD",
-                                    value=str(unique_dates[0].date()),
-                                    style={"marginRight": "10px", "width": "120px"}
-                                ),
-                                html.Label("End Date:"),
-                                dcc.Input(
-                                    id="end-date-input",
-                                    type="text",
-                                    placeholder="YYYY-MM-DD",
-                                    value=str(unique_dates[-1].date()),
-                                    style={"marginRight": "10px", "width": "120px"}
-                                ),
-                                html.Button(
-                                    "Apply",
-                                    id="apply-date-button",
-                                    n_clicks=0,
-                                    style={"marginLeft": "10px"}
-                                ),
-                                html.Button(
-                                    "Reset",
-                                    id="reset-button",
-                                    n_clicks=0,
-                                    style={"marginLeft": "10px"}
-                                ),
-                            ], style={"marginBottom": "15px", "display": "flex", "alignItems": "center"}),
-
-                            dcc.RangeSlider(
-                                id="date-slider",
-                                min=0,
-                                max=len(unique_dates) - 1,
-                                value=[0, len(unique_dates) - 1],
-                                marks={
-                                    i: str(index_to_date[i].year)
-                                    for i in range(0, len(unique_dates), 50)
-                                },
-                                tooltip={"placement": "bottom", "always_visible": True},
-                                className="blue-slider"  # default class for color
-                            ),
-                            html.P("Filters:"),
-                            dcc.Dropdown(
-                                id="state-dropdown",
-                                options=state_options,
-                                placeholder="Select State(s)",
-                                multi=True,
-                                style={"marginBottom": "10px"}
-                            ),
-
-                            dcc.Dropdown(
-                                id="species-dropdown",
-                                options=species_options,
-                                placeholder="Select Shark Species",
-                                multi=True,
-                                style={"marginBottom": "10px"}
-                            ),
-                            dcc.Dropdown(
-                                id="month-dropdown",
-                                options=month_options,
-                                placeholder="Select Month(s)",
-                                multi=True,
-                                style={"marginBottom": "10px"}
-                            ),
-                            dcc.Dropdown(
-                                id="dayofweek-dropdown",
-                                options=dayofweek_options,
-                                placeholder="Select Day(s)",
-                                multi=True,
-                                style={"marginBottom": "10px"}
-                            ),
-                            dcc.Dropdown(
-                                id="victim-activity-dropdown",
-                                options=victim_activity_options,
-                                placeholder="Select Victim Activity",
-                                multi=True
-                            ),
-
-                            # Third Chart (Histogram) below the Filters
-                            html.Div(
-                                style={
-                                    "marginTop": "20px",
-                                    "height": "auto",
-                                    "backgroundColor": "#F3F3F3",
-                                    "padding": "10px"
-                                },
-                                children=[
-                                    html.H4("Analyze Contributing Factors", style={"paddingLeft": "12px", "color": "grey"}),
-
-                                    # Radio buttons to choose histogram type
-                                    dcc.RadioItems(
-                                        id="histogram-type",
-                                        options=[
-                                            {"label": "Victim Age", "value": "age"},
-                                            {"label": "State", "value": "state"},
-                                            {"label": "Month", "value": "month"},
-                                            {"label": "Day of Week", "value": "dayofweek"},
-                                            {"label": "Site category", "value": "sitecategory"},
-                                            {"label": "Victim activity", "value": "activity"},
-                                        ],
-                                        value="age",  # Default
-                                        inline=True,
-                                        style={"marginBottom": "15px", "color": "grey"} 
-                                    ),
+# Help modal (static, so it is built only once)
+HELP_MODAL = html.Div(
+    id="help-modal",
+    style={
+        "display": "none",
+        "position": "fixed",
+        "top": "20%",
+        "left": "30%",
+        "width": "40%",
+        "height": "auto",
+        "backgroundColor": "white",
+        "boxShadow": "0px 0px 10px rgba(0, 0, 0, 0.5)",
+        "zIndex": 1000,
+        "padding": "20px",
+        "borderRadius": "10px",
+        "color": "black",
+    },
+    children=[
+        html.Button(
+            "Close",
+            id="close-help-modal",
+            style={"float": "right", "margin": "10px"}
+        ),
+        html.Div(
+            children=[
+                html.H4("How to Use This Tool"),
+                html.P(
+                    "Welcome! This dashboard provides an interactive interface for "
+                    "exploring shark incident data in Australia. Below are some pointers "
+                    "on how to navigate and filter the data:"
+                ),
+                html.Ul([
+                    html.Li(
+                        "Use the date filters and slider to narrow down incidents within a specific time range. "
+                        "Click 'Apply' to filter or 'Reset' to clear all filters."
+                    ),
+                    html.Li(
+                        "Select states, shark species, months, days of the week, or victim activities "
+                        "from the dropdowns to refine your search further."
+                    ),
+                    html.Li(
+                        "Analyze the contributing factors using the histogram. "
+                        "Switch between different data dimensions such as 'Victim Age', 'State', 'Month', "
+                        "'Day of Week', 'Site Category', or 'Victim Activity' using the radio buttons."
+                    ),
+                    html.Li(
+                        "Click on a bar in the histogram to filter other charts and graphs based on the selection. "
+                        "You can toggle your selection or use the 'Clear Selection' button to reset it."
+                    ),
+                    html.Li(
+                        "View detailed shark incident data on the map. You can zoom, pan, and select geographic regions "
+                        "to analyze incidents by location. Box-select (click and drag) to isolate specific points."
+                    ),
+                    html.Li(
+                        "The stacked bar chart shows shark species grouped by 'Provoked' or 'Unprovoked' incidents. "
+                        "Only the top 10 species are shown, with the rest grouped under 'Other'."
+                    ),
+                    html.Li(
+                        "Use the Parallel Coordinates Plot to explore numeric variables such as water depth, "
+                        "distance to shore, total water depth, and time in water. The plot is color-coded based on "
+                        "the type of injury for added insight. The color codings are: uninjured (0), injured (1), fatal (2)."
+                    ),
+                    html.Li(
+                        "Enable Colorblind Mode using the 'Toggle Colorblind Mode' button at the top-left. "
+                        "This updates all charts to use a colorblind-friendly palette."
+                    ),
+                    html.Li(
+                        "Open the modal window by clicking on a point on the map, then use the 'Previous' and 'Next' "
+                        "buttons to browse through incidents in detail."
+                    ),
+                ]),
+                html.P(
+                    "Feel free to experiment with the filters in any order to discover trends in the data. "
+                    "Click 'Close' to exit this help modal."
+                ),
+            ],
+            style={"color": "black"},
+        ),
+    ]
+)
+
+
+def serve_layout():
+    """
+    Build the page layout for a new page load. The static modals are shared
+    module-level components and the dropdown options are precomputed at load.
+    :return: the root html.Div of the app
+    """
+    return html.Div(style={"position": "relative"}, children=[
+
+        # (1) Button & Store for toggling colorblind mode
+        html.Div(
+            [
+                html.Button(
+                    "Toggle Colorblind Mode",
+                    id="toggle-colorblind-button",
+                    n_clicks=0,
+                    style={
+                        "zIndex": 9999
+                    }
+                ),
+                html.Button(
+                    "Help",
+                    id="help-button",
+                    n_clicks=0,
+                    style={
+                        "zIndex": 9999
+                    }
+                )
+            ],
+            style={
+                "position": "absolute",
+                "top": "10px",
+                "left": "10px",
+                "display": "flex",
+                "alignItems": "center"
+            }
+        ),
 
-                                    # Buttons for applying or clearing histogram selections
+        html.Div(
+            id="background-container",
+            children=[
+                html.Div(
+                    className="row",
+                    children=[
+                        # Left Column (Controls + Third Chart)
+                        html.Div(
+                            className="four columns div-user-controls",
+                            children=[
+                                html.H2("SharkWatch: Shark Incidents in Australia"),
+
+                                # Date Range (RangeSlider + inputs)
+                                html.P("Select a date range to filter incidents."),
+                                html.Div([
+                                    html.Label("Start Date:"),
+                                    dcc.Input(
+                                        id="start-date-input",
+                                        type="text",
+                                        placeholder="YYYY-MM-DD",
+                                        value=str(unique_dates[0].date()),
+                                        style={"marginRight": "10px", "width": "120px"}
+                                    ),
+                                    html.Label("End Date:"),
+                                    dcc.Input(
+                                        id="end-date-input",
+                                        type="text",
+                                        placeholder="YYYY-MM-DD",
+                                        value=str(unique_dates[-1].date()),
+                                        style={"marginRight": "10px", "width": "120px"}
+                                    ),
                                     html.Button(
-                                        "Apply Selection",
-                                        id="update-histogram-button",
+                                        "Apply",
+                                        id="apply-date-button",
                                         n_clicks=0,
-                                        style={"marginTop": "15px", "marginBottom": "15px"}
+                                        style={"marginLeft": "10px"}
                                     ),
                                     html.Button(
-                                        "Clear Selection",
-                                        id="clear-histogram-selection",
+                                        "Reset",
+                                        id="reset-button",
                                         n_clicks=0,
-                                        style={"marginBottom": "15px"}
+                                        style={"marginLeft": "10px"}
                                     ),
-                                    dcc.Graph(
-                                        id="third-chart",
-                                        style={"height": "85%", "width": "100%"},
-                                        config={"displayModeBar": False},
-                                    )
-                                ]
-                            ),
-                        ],
-                    ),
+                                ], style={"marginBottom": "15px", "display": "flex", "alignItems": "center"}),
+
+                                dcc.RangeSlider(
+                                    id="date-slider",
+                                    min=0,
+                                    max=len(unique_dates) - 1,
+                                    value=[0, len(unique_dates) - 1],
+                                    marks=slider_marks,
+                                    tooltip={"placement": "bottom", "always_visible": True},
+                                    className="blue-slider"  # default class for color
+                                ),
+                                html.P("Filters:"),
+                                dcc.Dropdown(
+                                    id="state-dropdown",
+                                    options=state_options,
+                                    placeholder="Select State(s)",
+                                    multi=True,
+                                    style={"marginBottom": "10px"}
+                                ),
 
-                    # Right Column (Map + Bar + PCP)
-                    html.Div(
-                        className="eight columns div-for-charts bg-grey",
-                        style={
-                            "display": "flex",
-                            "flexDirection": "column",
-                            "height": "100vh",
-                            "padding": "10px",
-                            "overflowY": "auto",
-                        },
-                        children=[
-                            # Map: top 50%
-                            html.Div(
-                                style={"flex": "0 0 50%", "marginBottom": "10px"},
-                                children=[
-                                    dcc.Graph(
-                                        id="map-graph",
-                                        config={"scrollZoom": True},
-                                        style={"height": "100%", "width": "100%"}
-                                    )
-                                ]
-                            ),
-                            # Bar + PCP side by side
-                            html.Div(
-                                style={
-                                    "flex": "0 0 50%",
-                                    "marginTop": "5px",
-                                    "display": "flex",
-                                    "flexDirection": "row",
-                                    "justifyContent": "space-between",
-                                },
-                                children=[
-                                    html.Div(
-                                        style={"flex": "1", "marginRight": "5px"},
-                                        children=[
-                                            html.H4(
-                                                "Shark Species Analysis",
-                                                style={"paddingLeft": "12px"}
-                                            ),
-                                            dcc.Graph(
-                                                id="pie-chart",
-                                                style={"height": "85%", "width": "100%"}
-                                            )
-                                        ]
-                                    ),
-                                    html.Div(
-                                        style={"flex": "1", "marginLeft": "5px"},
-                                        children=[
-                                            html.Div(
-                                                style={"display": "flex", "alignItems": "center", "justifyContent": "space-between"},
-                                                children=[
-                                                    html.H4("Shark Profiles", style={"paddingLeft": "12px"}),
-                                                ],
-                                            ),
-                                            dcc.Graph(
-                                                id="pcp-graph",
-                                                style={"height": "85%", "width": "100%"}
-                                            ),
-                                        ],
-                                    ),
-                                ],
-                            ),
-                        ],
-                    ),
-                ],
-            ),
-        ],
-    ),
-
-    # --------------------------------------------------------------------------
-    # Stores (shared data between callbacks)
-    # --------------------------------------------------------------------------
-    dcc.Store(id="selected-incidents-store", data={"rows": [], "current_index": 0}),
-    dcc.Store(id="filtered-data-store", data=df.to_dict("records")),
-    dcc.Store(id="pie-selected-species", data=None),
-    dcc.Store(id="histogram-click-store", data=None),
-    dcc.Store(id="colorblind-store", data=False),
-    dcc.Store(id="selected-bins", data={"hist_type": "age", "values": []}),
-    dcc.Store(id="temp-bin-selection", data={"hist_type": None, "values": []}),
-
-    # Modal to display detailed incident info
-    html.Div(
-        id="info-modal",
-        style={
-            "display": "none",
-            "position": "fixed",
-            "top": "20%",
-            "left": "30%",
-            "width": "40%",
-            "height": "auto",
-            "backgroundColor": "white",
-            "boxShadow": "0px 0px 10px rgba(0, 0, 0, 0.5)",
-            "zIndex": 1000,
-            "padding": "20px",
-            "borderRadius": "10px",
-        },
-        children=[
-            html.Button("Close", id="close-modal", style={"float": "right", "margin": "10px"}),
-            html.Div(
-                style={"marginBottom": "10px", "textAlign": "center"},
-                children=[
-                    html.Button(
-                        "Previous",
-                        id="prev-incident",
-                        n_clicks=0,
-                        style={"marginRight": "20px", "padding": "8px 16px"}
-                    ),
-                    html.Button(
-                        "Next",
-                        id="next-incident",
-                        n_clicks=0,
-                        style={"padding": "8px 16px"}
-                    ),
-                ],
-            ),
-            html.Div(id="modal-incident-content"),
-        ],
-    ),
-
-    # Help modal
-    html.Div(
-        id="help-modal",
-        style={
-            "display": "none",
-            "position": "fixed",
-            "top": "20%",
-            "left": "30%",
-            "width": "40%",
-            "height": "auto",
-            "backgroundColor": "white",
-            "boxShadow": "0px 0px 10px rgba(0, 0, 0, 0.5)",
-            "zIndex": 1000,
-            "padding": "20px",
-            "borderRadius": "10px",
-            "color": "black",
-        },
-        children=[
-            html.Button(
-                "Close",
-                id="close-help-modal",
-                style={"float": "right", "margin": "10px"}
-            ),
-            html.Div(
-                children=[
-                    html.H4("How to Use This Tool"),
-                    html.P(
-                        "Welcome! This dashboard provides an interactive interface for "
-                        "exploring shark incident data in Australia. Below are some pointers "
-                        "on how to navigate and filter the data:"
-                    ),
-                    html.Ul([
-                        html.Li(
-                            "Use the date filters and slider to narrow down incidents within a specific time range. "
-                            "Click 'Apply' to filter or 'Reset' to clear all filters."
-                        ),
-                        html.Li(
-                            "Select states, shark species, months, days of the week, or victim activities "
-                            "from the dropdowns to refine your search further."
-                        ),
-                        html.Li(
-                            "Analyze the contributing factors using the histogram. "
-                            "Switch between different data dimensions such as 'Victim Age', 'State', 'Month', "
-                            "'Day of Week', 'Site Category', or 'Victim Activity' using the radio buttons."
-                        ),
-                        html.Li(
-                            "Click on a bar in the histogram to filter other charts and graphs based on the selection. "
-                            "You can toggle your selection or use the 'Clear Selection' button to reset it."
-                        ),
-                        html.Li(
-                            "View detailed shark incident data on the map. You can zoom, pan, and select geographic regions "
-                            "to analyze incidents by location. Box-select (click and drag) to isolate specific points."
-                        ),
-                        html.Li(
-                            "The stacked bar chart shows shark species grouped by 'Provoked' or 'Unprovoked' incidents. "
-                            "Only the top 10 species are shown, with the rest grouped under 'Other'."
-                        ),
-                        html.Li(
-                            "Use the Parallel Coordinates Plot to explore numeric variables such as water depth, "
-                            "distance to shore, total water depth, and time in water. The plot is color-coded based on "
-                            "the type of injury for added insight. The color codings are: uninjured (0), injured (1), fatal (2)."
-                        ),
-                        html.Li(
-                            "Enable Colorblind Mode using the 'Toggle Colorblind Mode' button at the top-left. "
-                            "This updates all charts to use a colorblind-friendly palette."
+                                dcc.Dropdown(
+                                    id="species-dropdown",
+                                    options=species_options,
+                                    placeholder="Select Shark Species",
+                                    multi=True,
+                                    style={"marginBottom": "10px"}
+                                ),
+                                dcc.Dropdown(
+                                    id="month-dropdown",
+                                    options=month_options,
+                                    placeholder="Select Month(s)",
+                                    multi=True,
+                                    style={"marginBottom": "10px"}
+                                ),
+                                dcc.Dropdown(
+                                    id="dayofweek-dropdown",
+                                    options=dayofweek_options,
+                                    placeholder="Select Day(s)",
+                                    multi=True,
+                                    style={"marginBottom": "10px"}
+                                ),
+                                dcc.Dropdown(
+                                    id="victim-activity-dropdown",
+                                    options=victim_activity_options,
+                                    placeholder="Select Victim Activity",
+                                    multi=True
+                                ),
+
+                                # Third Chart (Histogram) below the Filters
+                                html.Div(
+                                    style={
+                                        "marginTop": "20px",
+                                        "height": "auto",
+                                        "backgroundColor": "#F3F3F3",
+                                        "padding": "10px"
+                                    },
+                                    children=[
+                                        html.H4("Analyze Contributing Factors", style={"paddingLeft": "12px", "color": "grey"}),
+
+                                        # Radio buttons to choose histogram type
+                                        dcc.RadioItems(
+                                            id="histogram-type",
+                                            options=[
+                                                {"label": "Victim Age", "value": "age"},
+                                                {"label": "State", "value": "state"},
+                                                {"label": "Month", "value": "month"},
+                                                {"label": "Day of Week", "value": "dayofweek"},
+                                                {"label": "Site category", "value": "sitecategory"},
+                                                {"label": "Victim activity", "value": "activity"},
+                                            ],
+                                            value="age",  # Default
+                                            inline=True,
+                                            style={"marginBottom": "15px", "color": "grey"} 
+                                        ),
+
+                                        # Buttons for applying or clearing histogram selections
+                                        html.Button(
+                                            "Apply Selection",
+                                            id="update-histogram-button",
+                                            n_clicks=0,
+                                            style={"marginTop": "15px", "marginBottom": "15px"}
+                                        ),
+                                        html.Button(
+                                            "Clear Selection",
+                                            id="clear-histogram-selection",
+                                            n_clicks=0,
+                                            style={"marginBottom": "15px"}
+                                        ),
+                                        dcc.Graph(
+                                            id="third-chart",
+                                            style={"height": "85%", "width": "100%"},
+                                            config={"displayModeBar": False},
+                                        )
+                                    ]
+                                ),
+                            ],
                         ),
-                        html.Li(
-                            "Open the modal window by clicking on a point on the map, then use the 'Previous' and 'Next' "
-                            "buttons to browse through incidents in detail."
+
+                        # Right Column (Map + Bar + PCP)
+                        html.Div(
+                            className="eight columns div-for-charts bg-grey",
+                            style={
+                                "display": "flex",
+                                "flexDirection": "column",
+                                "height": "100vh",
+                                "padding": "10px",
+                                "overflowY": "auto",
+                            },
+                            children=[
+                                # Map: top 50%
+                                html.Div(
+                                    style={"flex": "0 0 50%", "marginBottom": "10px"},
+                                    children=[
+                                        dcc.Graph(
+                                            id="map-graph",
+                                            config={"scrollZoom": True},
+                                            style={"height": "100%", "width": "100%"}
+                                        )
+                                    ]
+                                ),
+                                # Bar + PCP side by side
+                                html.Div(
+                                    style={
+                                        "flex": "0 0 50%",
+                                        "marginTop": "5px",
+                                        "display": "flex",
+                                        "flexDirection": "row",
+                                        "justifyContent": "space-between",
+                                    },
+                                    children=[
+                                        html.Div(
+                                            style={"flex": "1", "marginRight": "5px"},
+                                            children=[
+                                                html.H4(
+                                                    "Shark Species Analysis",
+                                                    style={"paddingLeft": "12px"}
+                                                ),
+                                                dcc.Graph(
+                                                    id="pie-chart",
+                                                    style={"height": "85%", "width": "100%"}
+                                                )
+                                            ]
+                                        ),
+                                        html.Div(
+                                            style={"flex": "1", "marginLeft": "5px"},
+                                            children=[
+                                                html.Div(
+                                                    style={"display": "flex", "alignItems": "center", "justifyContent": "space-between"},
+                                                    children=[
+                                                        html.H4("Shark Profiles", style={"paddingLeft": "12px"}),
+                                                    ],
+                                                ),
+                                                dcc.Graph(
+                                                    id="pcp-graph",
+                                                    style={"height": "85%", "width": "100%"}
+                                                ),
+                                            ],
+                                        ),
+                                    ],
+                                ),
+                            ],
                         ),
-                    ]),
-                    html.P(
-                        "Feel free to experiment with the filters in any order to discover trends in the data. "
-                        "Click 'Close' to exit this help modal."
-                    ),
-                ],
-                style={"color": "black"},
-            ),
-        ]
-    )
-])
+                    ],
+                ),
+            ],
+        ),
+
+        # --------------------------------------------------------------------------
+        # Stores (shared data between callbacks)
+        # --------------------------------------------------------------------------
+        dcc.Store(id="selected-incidents-store", data={"rows": [], "current_index": 0}),
+        dcc.Store(id="filtered-data-store", data=default_filter_spec),
+        dcc.Store(id="pie-selected-species", data=None),
+        dcc.Store(id="histogram-click-store", data=None),
+        dcc.Store(id="colorblind-store", data=False),
+        dcc.Store(id="selected-bins", data={"hist_type": "age", "values": []}),
+        dcc.Store(id="temp-bin-selection", data={"hist_type": None, "values": []}),
+
+        # Modals to display detailed incident info and usage help
+        INFO_MODAL,
+        HELP_MODAL,
+    ])
+
+
+app.layout = serve_layout
 
 # ------------------------------------------------------------------------------
 # (A) NEW CALLBACK: Toggle the colorblind-store
@@ -586,6 +830,31 @@ def update_slider_classname(colorblind_active):
     """
     return "grey-slider" if colorblind_active else "blue-slider"
 
+@lru_cache(maxsize=256)
+def parse_date_input(date_value):
+    """
+    Parses the text of a date input, caching the result for repeated values.
+
+    :param date_value: A date string in 'YYYY-MM-DD' format (or None).
+    :return: The parsed pd.Timestamp, or NaT for empty input.
+    :raises ValueError: If the value cannot be parsed as a date.
+    """
+    return pd.Timestamp(date_value)
+
+def find_date_index(date, side):
+    """
+    Finds the slider position of a date with a binary search over the sorted unique day numbers.
+
+    :param date: A pd.Timestamp (e.g. from parse_date_input).
+    :param side: 'left' for a range start (first date on or after the value),
+                 'right' for a range end (last date on or before the value).
+    :return: The matching position in `index_to_date`; len(index_to_date) for a start
+             after the last date, -1 for an end before the first date.
+    """
+    day = date.to_datetime64().astype("datetime64[D]").astype("int64")
+    position = int(unique_days.searchsorted(day, side=side))
+    return position if side == "left" else position - 1
+
 # ------------------------------------------------------------------------------
 # 1) Single Callback to Handle "Apply" AND "Reset" Buttons
 # ------------------------------------------------------------------------------
@@ -630,30 +899,27 @@ def apply_or_reset(
        - If 'Apply': validates the text-input date ranges and adjusts the slider accordingly.
        - If 'Reset': returns all filters to their default states.
     """
-    ctx = dash.callback_context
-    if not ctx.triggered:
+    triggered_id = ctx.triggered_id
+    if triggered_id is None:
         raise PreventUpdate
 
-    triggered_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
     if triggered_id == "apply-date-button":
-        try:
-            start_idx = date_to_index[pd.to_datetime(current_start_date)]
-        except Exception:
-            start_idx = current_slider[0]
-            current_start_date = index_to_date[start_idx].strftime("%Y-%m-%d")
-
-        try:
-            end_idx = date_to_index[pd.to_datetime(current_end_date)]
-        except Exception:
-            end_idx = current_slider[1]
-            current_end_date = index_to_date[end_idx].strftime("%Y-%m-%d")
-
-        start_idx = max(0, min(start_idx, len(unique_dates) - 1))
-        end_idx = max(0, min(end_idx, len(unique_dates) - 1))
-
+        # An invalid or empty date keeps the matching end of the current slider range
+        typed_dates = []
+        for date_value, slider_idx in zip((current_start_date, current_end_date), current_slider):
+            try:
+                date = parse_date_input(date_value)
+            except (ValueError, TypeError):
+                date = pd.NaT
+            typed_dates.append(index_to_date[slider_idx] if pd.isna(date) else date)
+        start_date, end_date = sorted(typed_dates)
+
+        # Snap the typed range inward to the incidents within it; a range without
+        # any incident leaves the slider as it is
+        start_idx = find_date_index(start_date, side="left")
+        end_idx = find_date_index(end_date, side="right")
         if start_idx > end_idx:
-            start_idx, end_idx = end_idx, start_idx
+            start_idx, end_idx = current_slider
 
         new_start_date = index_to_date[start_idx].strftime("%Y-%m-%d")
         new_end_date = index_to_date[end_idx].strftime("%Y-%m-%d")
@@ -714,12 +980,10 @@ def handle_bar_click_and_reset(bar_click, reset_clicks):
     :param reset_clicks: Number of times the 'Reset' button has been clicked.
     :return: A string combining the clicked species and provoked/unprovoked status, or None on reset.
     """
-    ctx = dash.callback_context
-    if not ctx.triggered:
+    triggered_id = ctx.triggered_id
+    if triggered_id is None:
         raise PreventUpdate
 
-    triggered_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
     if triggered_id == "reset-button":
         return None
 
@@ -730,6 +994,120 @@ def handle_bar_click_and_reset(bar_click, reset_clicks):
 
     return dash.no_update
 
+def get_coordinate_keys(latitudes, longitudes):
+    """
+    Packs coordinates (rounded to 5 decimals, as in the data) into one integer key
+    per point, so that sets of locations can be compared with np.isin.
+
+    :param latitudes: An array of latitudes.
+    :param longitudes: An array of longitudes (of the same length).
+    :return: An int64 NumPy array with one key per point.
+    """
+    lat_units = np.round(np.asarray(latitudes, dtype=float) * 1e5).astype(np.int64)
+    lon_units = np.round(np.asarray(longitudes, dtype=float) * 1e5).astype(np.int64)
+    # |lon_units| <= 18_000_000, so every (lat, lon) pair gets a distinct key
+    return lat_units * 40_000_000 + lon_units
+
+
+# Incident dates as a datetime64 array (sorted, as `df` is sorted by 'Date')
+date_values = df["Date"].to_numpy()
+
+# Location key of every incident, matched against the coordinates of a map selection
+coordinate_keys = get_coordinate_keys(df["Latitude"].to_numpy(), df["Longitude"].to_numpy())
+
+# Positions of the incidents at every location key, so a map click needs no scan of `df`
+incidents_by_coord = df.groupby(coordinate_keys, sort=False).indices
+
+
+def get_date_rows(slider_range):
+    """
+    Finds the rows of `df` within a date slider range. Since `df` is sorted by 'Date',
+    they form one contiguous block, located with two binary searches.
+
+    :param slider_range: The [start_idx, end_idx] positions of the date slider.
+    :return: A slice of the row positions in the range.
+    """
+    start_date = index_to_date[slider_range[0]].to_datetime64()
+    end_date = index_to_date[slider_range[1]].to_datetime64()
+    start = int(date_values.searchsorted(start_date, side="left"))
+    stop = int(date_values.searchsorted(end_date, side="right"))
+    return slice(start, max(start, stop))
+
+
+def category_mask(column, values):
+    """
+    Tests which rows of a categorical column hold one of the given values,
+    by comparing the integer category codes with np.isin.
+
+    :param column: A categorical column of `df` with precomputed category_codes.
+    :param values: The selected values (values that do not occur match no row).
+    :return: A boolean NumPy array with one entry per row of `df`.
+    """
+    codes = df[column].cat.categories.get_indexer(values)
+    return np.isin(category_codes[column], codes[codes >= 0])
+
+
+@lru_cache(maxsize=8)
+def get_non_date_mask(filter_spec):
+    """
+    Applies the dropdown, histogram bin and map filters of a filter specification
+    (everything but the date range). The result is memoized, so moving the date slider
+    reuses the mask of the other filters instead of evaluating them again.
+
+    :param filter_spec: A JSON string as returned by get_filter_spec, without dates.
+    :return: A read-only boolean NumPy array with one entry per row of `df`.
+    """
+    spec = json.loads(filter_spec)
+
+    # Filter by dropdowns and any histogram bin selection, on the category codes
+    category_filters = [
+        ("State", spec["states"]),
+        ("Shark.common.name", spec["species"]),
+        ("Month", spec["months"]),
+        ("DayOfWeek", spec["dows"]),
+        ("Victim.activity", spec["activities"]),
+    ]
+    if spec["bins"] and spec["bins"]["hist_type"] in histogram_columns:
+        category_filters.append((histogram_columns[spec["bins"]["hist_type"]], spec["bins"]["values"]))
+
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in category_filters:
+        if values:
+            mask &= category_mask(column, values)
+
+    # Keep only the rows whose lat/long is in the coordinates selected on the map
+    if spec["coords"]:
+        selected_lat, selected_lon = np.array(spec["coords"], dtype=float).T
+        mask &= np.isin(coordinate_keys, get_coordinate_keys(selected_lat, selected_lon))
+
+    # The mask is shared between specifications that only differ in their dates
+    mask.flags.writeable = False
+    return mask
+
+
+@lru_cache(maxsize=32)
+def get_filtered_rows(filter_spec):
+    """
+    Applies a filter specification to the global DataFrame. The result is memoized,
+    so the figure callbacks that receive the same specification share the work.
+
+    :param filter_spec: A JSON string as returned by get_filter_spec.
+    :return: A NumPy array with the positions of the filtered rows in `df`.
+    """
+    spec = json.loads(filter_spec)
+    mask = get_non_date_mask(get_filter_spec(
+        None, spec["states"], spec["species"], spec["months"],
+        spec["dows"], spec["activities"], spec["bins"], spec["coords"]
+    ))
+
+    # Filter by date slider (the rows in the range are one contiguous block, so only
+    # that block of the mask is scanned); only the positions are materialized
+    if spec["dates"]:
+        date_rows = get_date_rows(spec["dates"])
+        return date_rows.start + np.flatnonzero(mask[date_rows])
+    return np.flatnonzero(mask)
+
+
 # ------------------------------------------------------------------------------
 # 3) “Master” Filtering Callback (includes state filter & histogram bin selection)
 # ------------------------------------------------------------------------------
@@ -744,114 +1122,173 @@ def handle_bar_click_and_reset(bar_click, reset_clicks):
         Input("dayofweek-dropdown", "value"),
         Input("victim-activity-dropdown", "value"),
         Input("selected-bins", "data"),
-    ]
+    ],
+    [State("filtered-data-store", "data")]
 )
 def update_filtered_data_store(
     slider_range, selected_states, selected_species,
     map_selected, selected_months, selected_dows,
-    selected_activities, selected_bins
+    selected_activities, selected_bins, current_spec
 ):
     """
-    Consolidates all filter inputs 
+    Consolidates all filter inputs into the filter specification of 'filtered-data-store'.
 
     :param slider_range: A list of two indices [start_idx, end_idx] 
                          referencing positions in the list of unique dates.
     :param selected_states: A list of states selected from the 'state-dropdown'.
     :param selected_species: A list of shark species selected from the 'species-dropdown'.
-    :param map_selected: Map selection data (not directly used here, but included for clarity).
+    :param map_selected: Map selection data (e.g., box/lasso); only rows at the
+                         selected lat/long coordinates remain.
     :param selected_months: A list of month names selected from the 'month-dropdown'.
     :param selected_dows: A list of days of the week selected from the 'dayofweek-dropdown'.
     :param selected_activities: A list of victim activities selected from the 'victim-activity-dropdown'.
     :param selected_bins: A dictionary containing the histogram filter selections, e.g. 
                          {"hist_type": "age", "values": [...]}
+    :param current_spec: The filter specification currently in the store.
 
-    :return: A list of dictionaries representing the filtered DataFrame rows.
+    :return: The filter specification (see get_filter_spec). Nothing is updated
+             (nor any figure callback depending on it) if the filters did not change.
     """
-    filtered_df_local = df.copy()
-
-    # Filter by date slider
-    if slider_range:
-        start_date = index_to_date[slider_range[0]]
-        end_date = index_to_date[slider_range[1]]
-        filtered_df_local = filtered_df_local[
-            (filtered_df_local["Date"] >= start_date) &
-            (filtered_df_local["Date"] <= end_date)
-        ]
+    # Round the lat/lon of the selected map points to match the data
+    selected_points = map_selected.get("points", []) if map_selected else []
+    selected_coords = [
+        (round(point["lat"], 5), round(point["lon"], 5)) for point in selected_points
+    ]
 
-    # Filter by dropdowns
-    if selected_states:
-        filtered_df_local = filtered_df_local[filtered_df_local["State"].isin(selected_states)]
-    if selected_species:
-        filtered_df_local = filtered_df_local[filtered_df_local["Shark.common.name"].isin(selected_species)]
-    if selected_months:
-        filtered_df_local = filtered_df_local[filtered_df_local["Month"].isin(selected_months)]
-    if selected_dows:
-        filtered_df_local = filtered_df_local[filtered_df_local["DayOfWeek"].isin(selected_dows)]
-    if selected_activities:
-        filtered_df_local = filtered_df_local[filtered_df_local["Victim.activity"].isin(selected_activities)]
-
-    # Apply any histogram bin filters
-    hist_type = selected_bins["hist_type"] if selected_bins else None
-    bin_list  = selected_bins["values"] if selected_bins else []
+    filter_spec = get_filter_spec(
+        slider_range, selected_states, selected_species, selected_months,
+        selected_dows, selected_activities, selected_bins, selected_coords
+    )
+    if filter_spec == current_spec:
+        raise PreventUpdate
+    return filter_spec
 
-    if hist_type and bin_list:
-        if hist_type == "age":
-            filtered_df_local = filtered_df_local[filtered_df_local["Victim.age.group"].isin(bin_list)]
-        elif hist_type == "state":
-            filtered_df_local = filtered_df_local[filtered_df_local["State"].isin(bin_list)]
-        elif hist_type == "month":
-            filtered_df_local = filtered_df_local[filtered_df_local["Month"].isin(bin_list)]
-        elif hist_type == "dayofweek":
-            filtered_df_local = filtered_df_local[filtered_df_local["DayOfWeek"].isin(bin_list)]
-        elif hist_type == "sitecategory":
-            filtered_df_local = filtered_df_local[filtered_df_local["Site.category"].isin(bin_list)]
-        elif hist_type == "activity":
-            filtered_df_local = filtered_df_local[filtered_df_local["Victim.activity"].isin(bin_list)]
 
-    return filtered_df_local.to_dict("records")
+@lru_cache(maxsize=32)
+def get_location_groups(filter_spec):
+    """
+    Groups the rows selected by a filter specification by location, with one np.unique
+    over their coordinate keys. The result is memoized, so clicks on the stacked bar
+    reuse it instead of regrouping all rows.
+
+    :param filter_spec: A JSON string as returned by get_filter_spec.
+    :return: A tuple (location_rows, location_index, location_counts): the position in `df`
+             of one incident per location, the location of every filtered row, and the
+             number of incidents per location.
+    """
+    rows = get_filtered_rows(filter_spec)
+    _, first, location_index, location_counts = np.unique(
+        coordinate_keys[rows], return_index=True, return_inverse=True, return_counts=True
+    )
+    return rows[first], location_index, location_counts
 
 
-@app.callback(
-    Output("filtered-data-store", "data", allow_duplicate=True),
-    [
-        Input("map-graph", "selectedData"),
-        State("filtered-data-store", "data"),
-    ],
-    prevent_initial_call=True,
-)
-def update_data_on_map_selection(selected_data, current_data):
+def get_bar_selection_mask(rows, species_sel, provoked_sel):
     """
-    Applies an additional filter based on a box or lasso selection on the map.
-    Only rows matching the selected lat/long coordinates will remain.
+    Tests which of the given rows match the species/provoked selection of the stacked bar,
+    by comparing the packed species/provoked codes of the rows with the selected codes.
 
-    :param selected_data: Data representing the map selection (e.g., box/lasso).
-    :param current_data: The current list of dictionaries stored in 'filtered-data-store'.
-    :return: An updated list of records filtered by the selected map points.
+    :param rows: Positions of rows in `df` (e.g. from get_filtered_rows).
+    :param species_sel: The selected species, or None for any species.
+    :param provoked_sel: The selected provoked/unprovoked status, or None for any status.
+    :return: A boolean NumPy array with one entry per position in `rows`.
     """
-    if not selected_data:
-        # If no selection is made, return the current data
-        raise PreventUpdate
+    species_code, provoked_code = (
+        df[column].cat.categories.get_indexer([value])[0] if value else None
+        for column, value in (("Shark.common.name", species_sel), ("Provoked/unprovoked", provoked_sel))
+    )
+    # A value that is not a category (such as the "Other" bar) matches no row
+    if species_code == -1 or provoked_code == -1:
+        return np.zeros(len(rows), dtype=bool)
+
+    # Compare the packed species/provoked codes (see species_provoked_codes)
+    codes = species_provoked_codes[rows]
+    if species_code is not None and provoked_code is not None:
+        return codes == (species_code + 1) * provoked_base + provoked_code + 1
+    if species_code is not None:
+        return codes // provoked_base == species_code + 1
+    if provoked_code is not None:
+        return codes % provoked_base == provoked_code + 1
+    return np.ones(len(rows), dtype=bool)
+
+
+@lru_cache(maxsize=64)
+def parse_treemap_path(treemap_path):
+    """
+    Splits the stacked bar selection into its species and provoked/unprovoked parts.
 
-    selected_points = selected_data.get("points", [])
-    if not selected_points:
-        raise PreventUpdate
+    :param treemap_path: A string such as 'white shark/unprovoked', or None.
+    :return: A tuple (species, provoked); missing parts are None.
+    """
+    if not treemap_path:
+        return None, None
+    path_parts = treemap_path.split("/")
+    species_sel = path_parts[0] if len(path_parts) >= 1 else None
+    provoked_sel = path_parts[1] if len(path_parts) >= 2 else None
+    return species_sel, provoked_sel
 
-    # Round lat/lon to match the data
-    selected_coords = [
-        (round(point["lat"], 5), round(point["lon"], 5)) for point in selected_points
-    ]
 
-    # Convert current_data to DataFrame for filtering
-    filtered_df = pd.DataFrame(current_data)
+def apply_figure_updates(figure, trace_updates, layout_updates):
+    """
+    Writes the values that change between updates into a figure skeleton, or into a
+    dash Patch when the browser already shows that skeleton, so that only these values
+    are sent instead of the whole figure.
+
+    :param figure: A figure dict from one of the get_*_figure functions, or a Patch.
+    :param trace_updates: One {property: value} dict per trace of the skeleton. A tuple
+                          property is a path to a nested property, e.g. ("marker", "size").
+    :param layout_updates: A {property: value} dict for the layout (same conventions).
+    :return: The updated figure dict or Patch.
+    """
+    def assign(target, prop, value):
+        *parents, last = prop if isinstance(prop, tuple) else (prop,)
+        for parent in parents:
+            target = target[parent]
+        target[last] = value
+
+    for i, updates in enumerate(trace_updates):
+        for prop, value in updates.items():
+            assign(figure["data"][i], prop, value)
+    for prop, value in layout_updates.items():
+        assign(figure["layout"], prop, value)
+    return figure
+
+
+@lru_cache(maxsize=2)
+def get_bar_figure(colorblind_active):
+    """
+    Builds the skeleton of the stacked bar chart: one (empty) trace per
+    provoked/unprovoked status, colored by status.
 
-    # Keep only the rows whose lat/long is in the selected coords
-    filtered_df = filtered_df[
-        filtered_df.apply(
-            lambda row: (row["Latitude"], row["Longitude"]) in selected_coords, axis=1
+    :param colorblind_active: Boolean indicating whether colorblind mode is enabled.
+    :return: A figure dict, to be filled in with apply_figure_updates
+             (it is cached per palette, so fill in a copy).
+    """
+    color_discrete_sequence = get_color_discrete_sequence(colorblind_active)
+    fig = go.Figure([
+        go.Bar(
+            x=[],
+            y=[],
+            name=provoked,
+            legendgroup=provoked,
+            marker_color=color_discrete_sequence[provoked_code % len(color_discrete_sequence)],
+            customdata=[],
+            hovertemplate=(
+                "Provoked/unprovoked=%{customdata[1]}<br>Shark.common.name=%{x}<br>Count=%{y}<extra></extra>"
+            ),
         )
-    ]
-
-    return filtered_df.to_dict("records")
+        for provoked_code, provoked in enumerate(df["Provoked/unprovoked"].cat.categories)
+    ])
+    fig.update_layout(
+        barmode="stack",
+        title="Shark Incidents by Species and Provocation",
+        legend_title_text="Provoked/unprovoked",
+        xaxis={"title": "Shark.common.name", "categoryorder": "array", "categoryarray": []},
+        yaxis_title="Count",
+        clickmode='event+select',
+        margin={"r": 0, "t": 40, "l": 0, "b": 0},
+    )
+    return fig.to_dict()
 
 
 @app.callback(
@@ -866,69 +1303,84 @@ def update_stacked_bar(filtered_data, colorblind_active):
     Creates a stacked bar chart showing the count of incidents by
     shark species and by provoked/unprovoked status.
 
-    :param filtered_data: A list of dictionaries from 'filtered-data-store' representing the filtered dataset.
+    :param filtered_data: The filter specification from 'filtered-data-store' (see get_filter_spec).
     :param colorblind_active: Boolean indicating whether colorblind mode is enabled.
-    :return: A Plotly figure object with stacked bars for each species and provocation status.
+    :return: A figure with stacked bars for each species and provocation status
+             (a Patch of the bars when only the filtered data changed).
     """
-    if not filtered_data:
-        fig = px.bar(title="No Data")
-        fig.update_layout(clickmode='event+select')
-        return fig
-
-    filtered_df_local = pd.DataFrame(filtered_data)
-    if filtered_df_local.empty:
-        fig = px.bar(title="No Data")
-        fig.update_layout(clickmode='event+select')
-        return fig
-
-    # Group by species and provoked/unprovoked
-    bar_data = (
-        filtered_df_local
-        .groupby(["Shark.common.name", "Provoked/unprovoked"], as_index=False)
-        .size()
-        .rename(columns={"size": "Count"})
-    )
+    rows = get_filtered_rows(filtered_data) if filtered_data else np.empty(0, dtype=np.intp)
+
+    # Count incidents per bar and provoked/unprovoked status with one bincount over the
+    # packed species/provoked codes (rows missing the species or the status are left out)
+    provoked_names = df["Provoked/unprovoked"].cat.categories
+    pair_codes = packed_bar_codes[species_provoked_codes[rows]]
+    bar_counts = np.bincount(pair_codes[pair_codes >= 0], minlength=len(bar_labels) * len(provoked_names))
+    bar_counts = bar_counts.reshape(len(bar_labels), len(provoked_names))
+
+    # The non-empty bars of every provoked/unprovoked trace (a status without bars is hidden)
+    trace_updates = []
+    for provoked_code, provoked in enumerate(provoked_names):
+        bar_mask = bar_counts[:, provoked_code] > 0
+        trace_updates.append({
+            "x": bar_labels[bar_mask].tolist(),
+            "y": bar_counts[bar_mask, provoked_code].tolist(),
+            "customdata": [[label, provoked] for label in bar_labels[bar_mask]],
+            "visible": bool(bar_mask.any()),
+        })
+    layout_updates = {
+        ("title", "text"): "Shark Incidents by Species and Provocation" if rows.size else "No Data",
+        # The bars with incidents, in the global order (an empty bar would leave a gap)
+        ("xaxis", "categoryarray"): bar_labels[bar_counts.sum(axis=1) > 0].tolist(),
+    }
 
-    # Calculate total incidents per species
-    species_totals = (
-        bar_data.groupby("Shark.common.name", as_index=False)["Count"]
-        .sum()
-        .sort_values("Count", ascending=False)
-    )
+    # A filter change only replaces the bars; other triggers redraw the whole figure
+    if ctx.triggered_id == "filtered-data-store":
+        figure = Patch()
+    else:
+        figure = deepcopy(get_bar_figure(colorblind_active))
+    return apply_figure_updates(figure, trace_updates, layout_updates)
 
-    # Keep only top N species, group others as "Other"
-    max_bars = 10
-    top_species = species_totals.head(max_bars)["Shark.common.name"].tolist()
 
-    bar_data["Shark.common.name"] = bar_data["Shark.common.name"].apply(
-        lambda x: x if x in top_species else "Other"
-    )
-    bar_data = (
-        bar_data.groupby(["Shark.common.name", "Provoked/unprovoked"], as_index=False)
-        .sum()
-    )
-    sorted_species_list = top_species + ["Other"]
+@lru_cache(maxsize=2)
+def get_map_figure(colorblind_active):
+    """
+    Builds the skeleton of the incident map: one (empty) bubble trace per
+    highlight group, "Other" and "Selected".
 
-    # Choose color palette (default or colorblind)
+    :param colorblind_active: Boolean indicating whether colorblind mode is enabled.
+    :return: A figure dict, to be filled in with apply_figure_updates
+             (it is cached per palette, so fill in a copy).
+    """
     color_discrete_sequence = get_color_discrete_sequence(colorblind_active)
-
-    fig = px.bar(
-        bar_data,
-        x="Shark.common.name",
-        y="Count",
-        color="Provoked/unprovoked",
-        barmode="stack",
-        color_discrete_sequence=color_discrete_sequence,
-        category_orders={"Shark.common.name": sorted_species_list},
-        custom_data=["Shark.common.name", "Provoked/unprovoked"],
-        title="Shark Incidents by Species and Provocation",
-    )
-
+    fig = go.Figure([
+        go.Scattermapbox(
+            lat=[],
+            lon=[],
+            mode="markers",
+            name=highlight,
+            marker=dict(
+                size=[],
+                sizemode="area",
+                sizeref=1,
+                color=color_discrete_sequence[i],
+                opacity=0.6,
+            ),
+            hovertemplate=(
+                "<b>%{marker.size}</b><br><br>"
+                "Latitude=%{lat}<br>Longitude=%{lon}<br>Count=%{marker.size}"
+                f"<extra>{highlight}</extra>"
+            ),
+        )
+        for i, highlight in enumerate(["Other", "Selected"])
+    ])
     fig.update_layout(
-        clickmode='event+select',
+        title_text="",
+        mapbox=dict(style="open-street-map", zoom=4, center={"lat": -25.0, "lon": 133.0}),
+        legend_title_text="Highlight",
         margin={"r": 0, "t": 40, "l": 0, "b": 0},
+        dragmode="select"
     )
-    return fig
+    return fig.to_dict()
 
 
 @app.callback(
@@ -945,82 +1397,53 @@ def update_map_from_filtered_data_and_treemap_path(filtered_data, treemap_path,
     If a specific species/provoked combination is selected in the stacked bar,
     those points are highlighted.
 
-    :param filtered_data: Current filtered dataset in dictionary form.
+    :param filtered_data: The filter specification of the current filtered dataset.
     :param treemap_path: A string combining the selected species and provoked/unprovoked status (e.g., 'White shark/Unprovoked').
     :param colorblind_active: Boolean indicating whether colorblind mode is enabled.
-    :return: A Plotly Mapbox figure with markers sized by incident count; selected species are highlighted.
+    :return: A Plotly Mapbox figure with markers sized by incident count; selected species are highlighted
+             (a Patch of the markers when only the data or the bar selection changed).
     """
-    # Check for empty data
-    if not filtered_data:
-        return px.scatter_mapbox(
-            pd.DataFrame({"Latitude": [], "Longitude": [], "Incident Count": []}),
-            lat="Latitude",
-            lon="Longitude",
-            size="Incident Count",
-            zoom=4,
-            center={"lat": -25.0, "lon": 133.0},
-            mapbox_style="open-street-map",
-            title="No Data"
-        )
+    rows = get_filtered_rows(filtered_data) if filtered_data else np.empty(0, dtype=np.intp)
 
-    df_local = pd.DataFrame(filtered_data)
-    if df_local.empty:
-        return px.scatter_mapbox(
-            pd.DataFrame({"Latitude": [], "Longitude": [], "Incident Count": []}),
-            lat="Latitude",
-            lon="Longitude",
-            size="Incident Count",
-            zoom=4,
-            center={"lat": -25.0, "lon": 133.0},
-            mapbox_style="open-street-map",
-            title="No Data"
-        )
+    # Per-location counts of the filtered data do not depend on the bar selection
+    if rows.size:
+        location_rows, location_index, location_counts = get_location_groups(filtered_data)
+    else:
+        location_rows = location_index = location_counts = np.empty(0, dtype=np.intp)
 
-    # Add a 'Highlight' column to mark selected vs other points
-    df_local["Highlight"] = "Other"
+    # Only the selected rows are counted again; "Other" is what remains of the location counts
     if treemap_path:
-        path_parts = treemap_path.split("/")
-        species_sel = path_parts[0] if len(path_parts) >= 1 else None
-        provoked_sel = path_parts[1] if len(path_parts) >= 2 else None
-
-        mask = pd.Series([True]*len(df_local))
-        if species_sel:
-            mask &= (df_local["Shark.common.name"] == species_sel)
-        if provoked_sel:
-            mask &= (df_local["Provoked/unprovoked"] == provoked_sel)
-
-        df_local.loc[mask, "Highlight"] = "Selected"
-
-    # Aggregate by Latitude/Longitude and highlight
-    bubble_data = (
-        df_local.groupby(["Latitude", "Longitude", "Highlight"])
-        .size()
-        .reset_index(name="Count")
-    )
-
-    # Determine color palette for colorblind mode
-    color_discrete_sequence = get_color_discrete_sequence(colorblind_active)
-
-    # Create scatter map
-    fig = px.scatter_mapbox(
-        bubble_data,
-        lat="Latitude",
-        lon="Longitude",
-        size="Count",
-        hover_name="Count",
-        color="Highlight",
-        zoom=4,
-        center={"lat": -25.0, "lon": 133.0},
-        mapbox_style="open-street-map",
-        color_discrete_sequence=color_discrete_sequence,
-    )
-
-    fig.update_traces(marker=dict(opacity=0.6), selector=dict(mode='markers'))
-    fig.update_layout(
-        margin={"r": 0, "t": 40, "l": 0, "b": 0},
-        dragmode="select"
-    )
-    return fig
+        species_sel, provoked_sel = parse_treemap_path(treemap_path)
+        mask = get_bar_selection_mask(rows, species_sel, provoked_sel)
+        selected_counts = np.bincount(location_index[mask], minlength=len(location_counts))
+    else:
+        selected_counts = np.zeros_like(location_counts)
+    highlight_counts = [location_counts - selected_counts, selected_counts]
+
+    latitudes = df["Latitude"].to_numpy()[location_rows]
+    longitudes = df["Longitude"].to_numpy()[location_rows]
+
+    # The bubbles of both highlight groups, bubble area proportional to the count
+    # (a group without bubbles is hidden)
+    size_ref = 2.0 * max(max(counts.max(initial=0) for counts in highlight_counts), 1) / (20 ** 2)
+    trace_updates = []
+    for counts in highlight_counts:
+        points = counts > 0
+        trace_updates.append({
+            "lat": latitudes[points].tolist(),
+            "lon": longitudes[points].tolist(),
+            ("marker", "size"): counts[points].tolist(),
+            ("marker", "sizeref"): size_ref,
+            "visible": bool(points.any()),
+        })
+    layout_updates = {("title", "text"): "" if rows.size else "No Data"}
+
+    # Filter and bar selection changes only replace the bubbles; other triggers redraw the whole figure
+    if ctx.triggered_id in ("filtered-data-store", "pie-selected-species"):
+        figure = Patch()
+    else:
+        figure = deepcopy(get_map_figure(colorblind_active))
+    return apply_figure_updates(figure, trace_updates, layout_updates)
 
 
 @app.callback(
@@ -1060,12 +1483,10 @@ def handle_modal_and_incidents(
     :return: A tuple to update the modal style, the stored incident data, the modal content, 
              previous/next button styles, and a className for background blur.
     """
-    ctx = dash.callback_context
-    if not ctx.triggered:
+    triggered_id = ctx.triggered_id
+    if triggered_id is None:
         return {"display": "none"}, {"rows": [], "current_index": 0}, "No incident data available", {}, {}, ""
 
-    triggered_id = ctx.triggered[0]["prop_id"]
-
     default_style = {"display": "none"}
     default_store = {"rows": [], "current_index": 0}
     default_content = html.Div("No incident data available")
@@ -1076,43 +1497,30 @@ def handle_modal_and_incidents(
     next_style = {"padding": "8px 16px"}
 
     # Close if 'Close' button is clicked
-    if "close-modal" in triggered_id:
+    if triggered_id == "close-modal":
         return default_style, default_store, default_content, prev_style, next_style, no_blur
 
-    # Filter data by date range
-    if slider_range:
-        start_date = index_to_date[slider_range[0]]
-        end_date = index_to_date[slider_range[1]]
-        filter_df = df[(df["Date"] >= start_date) & (df["Date"] <= end_date)]
-    else:
-        filter_df = df.copy()
-
-    # Filter by selected species if any
-    if selectedSpecies:
-        filter_df = filter_df[filter_df["Shark.common.name"].isin(selectedSpecies)]
-
     # If the map was clicked, gather incident details for the clicked location's coordinates
-    if "map-graph.clickData" in triggered_id and clickData:
-        lat_clicked = round(clickData["points"][0]["lat"], 5)
-        lon_clicked = round(clickData["points"][0]["lon"], 5)
-
-        clicked_incidents = filter_df[
-            (filter_df["Latitude"] == lat_clicked) &
-            (filter_df["Longitude"] == lon_clicked)
-        ]
-
-        rows = []
-        for _, row in clicked_incidents.iterrows():
-            species = row.get("Shark.common.name", "Unknown")
-            date_str = (
-                row["Date"].date().isoformat() if pd.notnull(row["Date"]) else "Unknown"
-            )
-            rows.append({
-                "Shark.common.name": species,
-                "Date": date_str,
-                "Victim.injury": str(row.get("Victim.injury", "")),
-                "Provoked/unprovoked": str(row.get("Provoked/unprovoked", "")),
-            })
+    if triggered_id == "map-graph" and clickData:
+        clicked_key = get_coordinate_keys([clickData["points"][0]["lat"]], [clickData["points"][0]["lon"]])[0]
+        incident_rows = incidents_by_coord.get(clicked_key, np.empty(0, dtype=np.intp))
+
+        # Keep the incidents in the date range and of the selected species, if any
+        if slider_range:
+            date_rows = get_date_rows(slider_range)
+            incident_rows = incident_rows[(incident_rows >= date_rows.start) & (incident_rows < date_rows.stop)]
+        if selectedSpecies:
+            incident_rows = incident_rows[category_mask("Shark.common.name", selectedSpecies)[incident_rows]]
+
+        # Build the modal rows column-wise (with the shark images of all incidents at once)
+        clicked_incidents = df.iloc[incident_rows]
+        rows = pd.DataFrame({
+            "Shark.common.name": clicked_incidents["Shark.common.name"].astype(object),
+            "Date": clicked_incidents["DateStr"],
+            "Victim.injury": clicked_incidents["Victim.injury"].map(str),
+            "Provoked/unprovoked": clicked_incidents["Provoked/unprovoked"].map(str),
+            "Image": get_shark_images(clicked_incidents["Shark.common.name"]),
+        }).to_dict("records")
 
         if not rows:
             return default_style, default_store, default_content, prev_style, next_style, no_blur
@@ -1155,15 +1563,19 @@ def handle_modal_and_incidents(
     }
 
     # Navigation: previous/next buttons
-    if "prev-incident" in triggered_id:
+    if triggered_id == "prev-incident":
         current_idx = max(0, current_idx - 1)
-    elif "next-incident" in triggered_id:
+    elif triggered_id == "next-incident":
         current_idx = min(len(rows) - 1, current_idx + 1)
 
     updated_store = {"rows": rows, "current_index": current_idx}
     content = build_modal_content(rows, current_idx)
     prev_style, next_style = get_nav_button_styles(len(rows), current_idx, prev_style, next_style)
 
+    # Paging keeps the modal open, so its style and the background blur stay as they are
+    if triggered_id in ("prev-incident", "next-incident"):
+        return dash.no_update, updated_store, content, prev_style, next_style, dash.no_update
+
     return modal_style, updated_store, content, prev_style, next_style, blurred
 
 
@@ -1185,7 +1597,7 @@ def build_modal_content(rows, idx):
     victim_injury = incident["Victim.injury"]
     provoked = incident["Provoked/unprovoked"]
 
-    image_filename = get_shark_image(species)
+    image_filename = incident.get("Image") or get_shark_image(species)
     total = len(rows)
 
     return html.Div(
@@ -1244,6 +1656,31 @@ def get_nav_button_styles(num_rows, current_idx, prev_style, next_style):
     return prev_style, next_style
 
 
+@lru_cache(maxsize=2)
+def get_histogram_figure(colorblind_active):
+    """
+    Builds the skeleton of the histogram (or bar chart) of contributing factors.
+
+    :param colorblind_active: Boolean to toggle colorblind-friendly palettes.
+    :return: A figure dict, to be filled in with apply_figure_updates
+             (it is cached per palette, so fill in a copy).
+    """
+    color_discrete_sequence = get_color_discrete_sequence(colorblind_active)
+    fig = go.Figure(go.Bar(
+        x=[],
+        y=[],
+        marker_color=color_discrete_sequence[0],
+    ))
+    fig.update_layout(
+        title_text="",
+        xaxis_title_text="",
+        yaxis_title="count",
+        clickmode="event+select",
+        margin={"r": 0, "t": 40, "l": 0, "b": 0}
+    )
+    return fig.to_dict()
+
+
 @app.callback(
     Output("third-chart", "figure"),
     [
@@ -1258,81 +1695,63 @@ def update_histogram(filtered_data, treemap_path, histogram_type, n_clicks, colo
     """
     Updates the histogram based on the currently filtered data
 
-    :param filtered_data: A list of dictionaries from the filtered dataset.
+    :param filtered_data: The filter specification of the filtered dataset.
     :param treemap_path: A string with the selected species/provoked state from the stacked bar chart.
     :param histogram_type: One of 'age', 'state', 'month', 'dayofweek', 'sitecategory', or 'activity'.
     :param n_clicks: Number of times the 'Apply Selection' button has been clicked.
     :param colorblind_active: Boolean to toggle colorblind-friendly palettes.
-    :return: A Plotly histogram (or bar chart) figure.
+    :return: A Plotly histogram (or bar chart) figure
+             (a Patch of the bars when the histogram type and palette did not change).
     """
-    if not filtered_data:
-        return px.scatter(title="No Data in Histogram")
-    df_local = pd.DataFrame(filtered_data)
-    if df_local.empty:
-        return px.scatter(title="No Data in Histogram")
-
-    # Apply species/provoked filter from the stacked bar
-    if treemap_path:
-        path_parts = treemap_path.split("/")
-        species_sel = path_parts[0] if len(path_parts) >= 1 else None
-        provoked_sel = path_parts[1] if len(path_parts) >= 2 else None
+    # Choose which column to show on the x-axis
+    titles = {
+        "age": "Histogram: Victim Age Group",
+        "dayofweek": "Bar Chart: Day of Week",
+        "state": "Bar Chart: State",
+        "month": "Bar Chart: Month",
+        "sitecategory": "Bar Chart: Site Category",
+        "activity": "Bar Chart: Victim Activity",
+    }
+    if histogram_type not in titles:
+        return INVALID_HISTOGRAM_FIGURE
+    x_axis = histogram_columns[histogram_type]
+    title = titles[histogram_type]
 
-        mask = pd.Series([True] * len(df_local))
-        if species_sel:
-            mask &= (df_local["Shark.common.name"] == species_sel)
-        if provoked_sel:
-            mask &= (df_local["Provoked/unprovoked"] == provoked_sel)
-        df_local = df_local[mask]
+    rows = get_filtered_rows(filtered_data) if filtered_data else np.empty(0, dtype=np.intp)
+    if rows.size == 0:
+        title = "No Data in Histogram"
 
-    # Choose which column to show on the x-axis
-    if histogram_type == "age":
-        df_local = df_local.dropna(subset=["Victim.age.group"])
-        x_axis = "Victim.age.group"
-        title = "Histogram: Victim Age Group"
-    elif histogram_type == "dayofweek":
-        df_local = df_local.dropna(subset=["DayOfWeek"])
-        x_axis = "DayOfWeek"
-        title = "Bar Chart: Day of Week"
-    elif histogram_type == "state":
-        df_local = df_local.dropna(subset=["State"])
-        x_axis = "State"
-        title = "Bar Chart: State"
-    elif histogram_type == "month":
-        df_local = df_local.dropna(subset=["Month"])
-        x_axis = "Month"
-        title = "Bar Chart: Month"
-    elif histogram_type == "sitecategory":
-        df_local = df_local.dropna(subset=["Site.category"])
-        x_axis = "Site.category"
-        title = "Bar Chart: Site Category"
-    elif histogram_type == "activity":
-        df_local = df_local.dropna(subset=["Victim.activity"])
-        x_axis = "Victim.activity"
-        title = "Bar Chart: Victim Activity"
+    # Apply species/provoked filter from the stacked bar
+    if treemap_path and rows.size:
+        species_sel, provoked_sel = parse_treemap_path(treemap_path)
+        rows = rows[get_bar_selection_mask(rows, species_sel, provoked_sel)]
+
+    # Count incidents per category with one bincount over the category codes
+    # (missing values are not counted); age groups, days and months keep their natural
+    # order with every bin on the axis, also the empty ones
+    codes = category_codes[x_axis][rows]
+    categories = df[x_axis].cat.categories
+    counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(categories)), index=categories)
+    category_order = {
+        "Victim.age.group": age_labels,
+        "DayOfWeek": custom_day_order,
+        "Month": custom_month_order,
+    }.get(x_axis)
+    if category_order and rows.size:
+        counts = counts.reindex(category_order, fill_value=0)
     else:
-        return px.scatter(title="Invalid Histogram Type")
-
-    color_discrete_sequence = get_color_discrete_sequence(colorblind_active)
+        counts = counts[counts > 0]
 
-    # Build the histogram (or bar chart)
-    fig = px.histogram(
-        df_local,
-        x=x_axis,
-        category_orders={
-            "Victim.age.group": custom_age_order, 
-            "DayOfWeek": custom_day_order, 
-            "Month": custom_month_order
-        },
-        title=title,
-        barnorm=None,
-        color_discrete_sequence=color_discrete_sequence,
-    )
+    trace_updates = [{"x": counts.index.tolist(), "y": counts.to_numpy().tolist()}]
+    layout_updates = {("title", "text"): title, ("xaxis", "title", "text"): x_axis}
 
-    fig.update_layout(
-        clickmode="event+select",
-        margin={"r": 0, "t": 40, "l": 0, "b": 0}
-    )
-    return fig
+    # Filter, bar selection and button updates only replace the bars;
+    # a new histogram type or palette redraws the whole figure
+    if ctx.triggered_id in ("filtered-data-store", "pie-selected-species", "update-histogram-button"):
+        figure = Patch()
+    else:
+        figure = deepcopy(get_histogram_figure(colorblind_active))
+    return apply_figure_updates(figure, trace_updates, layout_updates)
 
 
 @app.callback(
@@ -1348,45 +1767,29 @@ def update_pcp_graph_no_grouping(filtered_data, treemap_path, colorblind_active)
     Updating the parallel coordinates plot to visualize numeric variables
     across incidents. The line color is determined by 'Victim.injury.num'.
 
-    :param filtered_data: A list of dictionaries representing the filtered dataset.
+    :param filtered_data: The filter specification representing the filtered dataset.
     :param treemap_path: Optional string from the stacked bar to filter by species/provoked.
     :param colorblind_active: Boolean to toggle a colorblind-friendly color scale.
     :return: A Plotly 'Parcoords' figure encoding numeric dimensions and injury severity.
     """
     if not filtered_data:
-        return px.scatter(title="No Data in PCP")
+        return NO_DATA_PCP_FIGURE
+
+    rows = get_filtered_rows(filtered_data)
+    if rows.size == 0:
+        return NO_DATA_PCP_FIGURE
 
-    df_local = pd.DataFrame(filtered_data)
-    if df_local.empty:
-        return px.scatter(title="No Data in PCP")
+    # Keep the rows with a value in every PCP column (known since loading the data)
+    keep = pcp_complete_rows[rows]
 
     # Apply filter from stacked bar (species/provoked)
     if treemap_path:
-        path_parts = treemap_path.split("/")
-        species_sel = path_parts[0] if len(path_parts) >= 1 else None
-        provoked_sel = path_parts[1] if len(path_parts) >= 3 else None
-
-        mask = pd.Series([True]*len(df_local))
-        if species_sel:
-            mask &= (df_local["Shark.common.name"] == species_sel)
-        if provoked_sel:
-            mask &= (df_local["Provoked/unprovoked"] == provoked_sel)
-        df_local = df_local[mask]
-
-    # Numeric columns for the PCP
-    numeric_cols = [
-        "Distance.to.shore.m",
-        "Depth.of.incident.m",
-        "Total.water.depth.m",
-        "Time.in.water.min"
-    ]
-    for c in numeric_cols:
-        df_local[c] = pd.to_numeric(df_local[c], errors="coerce")
+        species_sel, provoked_sel = parse_treemap_path(treemap_path)
+        keep &= get_bar_selection_mask(rows, species_sel, provoked_sel)
 
-    # Drop rows where any needed column is NaN
-    df_local = df_local.dropna(subset=numeric_cols)
-    if df_local.empty:
-        return px.scatter(title="No Data for PCP")
+    if not keep.any():
+        return NO_ROWS_PCP_FIGURE
+    df_local = df.iloc[rows[keep]]
 
     # Choose color scale based on colorblind mode
     color_map = px.colors.sequential.Cividis if colorblind_active else px.colors.sequential.Bluered
@@ -1394,7 +1797,7 @@ def update_pcp_graph_no_grouping(filtered_data, treemap_path, colorblind_active)
     # Create Parallel Coordinates Plot using plotly.graph_objects
     fig = go.Figure(data=go.Parcoords(
         line=dict(
-            color=df_local['Victim.injury.num'],
+            color=df_local['Victim.injury.num'].to_numpy(),
             colorscale=color_map,
             showscale=True,
             cmin=df_local['Victim.injury.num'].min(),
@@ -1403,23 +1806,23 @@ def update_pcp_graph_no_grouping(filtered_data, treemap_path, colorblind_active)
         dimensions=[
             dict(
                 label="Shore Dist (m)",
-                values=df_local["Distance.to.shore.m"],
+                values=df_local["Distance.to.shore.m"].to_numpy(),
                 range=[df_local["Distance.to.shore.m"].min(), 4000],
                 constraintrange=[10, 50]  # Example highlighted range
             ),
             dict(
                 label="Incident Depth (m)",
-                values=df_local["Depth.of.incident.m"],
+                values=df_local["Depth.of.incident.m"].to_numpy(),
                 range=[df_local["Depth.of.incident.m"].min(), df_local["Depth.of.incident.m"].max()],
             ),
             dict(
                 label="Total Water Depth (m)",
-                values=df_local["Total.water.depth.m"],
+                values=df_local["Total.water.depth.m"].to_numpy(),
                 range=[df_local["Total.water.depth.m"].min(), df_local["Total.water.depth.m"].max()],
             ),
             dict(
                 label="Time in Water (min)",
-                values=df_local["Time.in.water.min"],
+                values=df_local["Time.in.water.min"].to_numpy(),
                 range=[df_local["Time.in.water.min"].min(), df_local["Time.in.water.min"].max()],
             )
         ]
@@ -1449,10 +1852,9 @@ def toggle_help_modal(help_clicks, close_help_clicks):
     :param close_help_clicks: The number of times the 'Close' button on the modal has been clicked.
     :return: A tuple controlling the modal's style and the background blur className.
     """
-    ctx = dash.callback_context
-    if not ctx.triggered:
+    triggered_id = ctx.triggered_id
+    if triggered_id is None:
         raise PreventUpdate
-    triggered_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
     if triggered_id == "help-button":
         return (
@@ -1498,7 +1900,11 @@ def accumulate_temp_bins(click_data, temp_store, current_hist_type):
     if not click_data or "points" not in click_data or not click_data["points"]:
         raise PreventUpdate
 
+    # A click without a bin (e.g. between bars) leaves the selection as it is
     bin_clicked = click_data["points"][0].get("x")
+    if bin_clicked is None:
+        raise PreventUpdate
+
     if temp_store is None:
         temp_store = {"hist_type": current_hist_type, "values": []}
 
@@ -1506,13 +1912,11 @@ def accumulate_temp_bins(click_data, temp_store, current_hist_type):
     if temp_store["hist_type"] != current_hist_type:
         temp_store = {"hist_type": current_hist_type, "values": []}
 
-    # Toggle the clicked bin
-    if bin_clicked in temp_store["values"]:
-        temp_store["values"].remove(bin_clicked)
-    else:
-        temp_store["values"].append(bin_clicked)
+    # Toggle the clicked bin with a set (the store keeps a sorted list, as JSON has no sets)
+    selected_values = set(temp_store["values"])
+    selected_values.symmetric_difference_update({bin_clicked})
 
-    return temp_store
+    return {"hist_type": current_hist_type, "values": sorted(selected_values)}
 
 
 @app.callback(
@@ -1521,38 +1925,59 @@ def accumulate_temp_bins(click_data, temp_store, current_hist_type):
         Output("temp-bin-selection", "data"),
     ],
     Input("clear-histogram-selection", "n_clicks"),
+    [
+        State("selected-bins", "data"),
+        State("temp-bin-selection", "data"),
+    ],
     prevent_initial_call=True
 )
-def clear_bin_selections(n_clicks):
+def clear_bin_selections(n_clicks, current_selection, temp_selection):
     """
     Clears both the main 'selected-bins' store and the temporary bin selection.
     
     :param n_clicks: Number of times the 'Clear Selection' button has been clicked.
-    :return: A tuple with two empty selection dictionaries.
+    :param current_selection: The bin selections currently in 'selected-bins'.
+    :param temp_selection: The temporary bin selections currently in 'temp-bin-selection'.
+    :return: A tuple with two empty selection dictionaries (a store without
+             selected bins is left as it is, so its dependent callbacks do not run).
     """
     if n_clicks is None:
         raise PreventUpdate
 
+    def is_empty(selection):
+        return not selection or not selection.get("values")
+
+    if is_empty(current_selection) and is_empty(temp_selection):
+        raise PreventUpdate
+
     empty_selection = {"hist_type": None, "values": []}
-    return empty_selection, empty_selection
+    return (
+        dash.no_update if is_empty(current_selection) else empty_selection,
+        dash.no_update if is_empty(temp_selection) else empty_selection,
+    )
 
 
 @app.callback(
     Output("selected-bins", "data", allow_duplicate=True),
     Input("update-histogram-button", "n_clicks"),
-    State("temp-bin-selection", "data"),
+    [
+        State("temp-bin-selection", "data"),
+        State("selected-bins", "data"),
+    ],
     prevent_initial_call=True
 )
-def apply_selected_bins(n_clicks, temp_selection):
+def apply_selected_bins(n_clicks, temp_selection, current_selection):
     """
     Moves the temporarily stored bin selections ('temp-bin-selection')
     into the main 'selected-bins' store, effectively applying the filter.
 
     :param n_clicks: Number of times the 'Apply Selection' button has been clicked.
     :param temp_selection: The temporary bin selections dictionary to be applied.
-    :return: The updated selections to store in 'selected-bins'.
+    :param current_selection: The bin selections currently in 'selected-bins'.
+    :return: The updated selections to store in 'selected-bins'
+             (nothing is updated if they are already applied).
     """
-    if n_clicks is None or not temp_selection:
+    if n_clicks is None or not temp_selection or temp_selection == current_selection:
         raise PreventUpdate
 
     return temp_selection
@@ -0,0 +1,16 @@
+import importlib
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """
+    Imports app.py from the repository root (it loads shark.csv relative to it).
+    """
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.syspath_prepend(REPO_ROOT)
+    return importlib.import_module("app")
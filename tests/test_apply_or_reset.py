@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def apply_dates(app, monkeypatch):
+    """
+    Calls apply_or_reset as a click on the 'Apply' button of the date inputs
+    and returns the new (start date, end date, slider range).
+    """
+    monkeypatch.setattr(app, "ctx", SimpleNamespace(triggered_id="apply-date-button"))
+
+    def apply(start_date, end_date, current_slider):
+        outputs = app.apply_or_reset(1, None, start_date, end_date, current_slider)
+        return outputs[:3]
+
+    return apply
+
+
+def slider_index(app, date):
+    return app.index_to_date.get_loc(pd.Timestamp(date))
+
+
+def test_typed_range_snaps_to_the_incidents_within_it(app, apply_dates):
+    full_range = [0, len(app.index_to_date) - 1]
+
+    # Reversed dates are swapped before snapping inward
+    start, end, slider = apply_dates("2000-09-30", "2000-03-15", full_range)
+
+    assert slider == [slider_index(app, "2000-04-01"), slider_index(app, "2000-09-01")]
+    assert (start, end) == ("2000-04-01", "2000-09-01")
+
+
+def test_typed_range_without_incidents_keeps_the_slider(app, apply_dates):
+    current_slider = [slider_index(app, "2000-02-01"), slider_index(app, "2000-12-01")]
+
+    start, end, slider = apply_dates("2000-05-01", "2000-08-31", current_slider)
+
+    assert slider == current_slider
+    assert (start, end) == ("2000-02-01", "2000-12-01")
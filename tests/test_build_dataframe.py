@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def write_csv(app, tmp_path, monkeypatch):
+    """
+    Writes the first rows of shark.csv, with the given changes, to a temporary
+    CSV file and points app.DATA_PATH to it.
+    """
+    def write(**changes):
+        raw = pd.read_csv(os.path.join(REPO_ROOT, app.DATA_PATH), nrows=len(next(iter(changes.values()))))
+        for column, values in changes.items():
+            raw[column] = values
+        path = tmp_path / "shark.csv"
+        raw.to_csv(path, index=False)
+        monkeypatch.setattr(app, "DATA_PATH", str(path))
+        return raw
+
+    return write
+
+
+def test_blank_site_category_is_kept(app, write_csv):
+    write_csv(**{"Site.category": ["coastal", np.nan, "Coastal"], "Victim.injury": ["fatal"] * 3})
+
+    df = app.build_dataframe()
+
+    assert len(df) == 3
+    assert df["Site.category"].isna().sum() == 1
+    assert list(df["Site.category"].cat.categories) == ["Coastal"]
+
+
+def test_victim_injury_spellings_are_normalized(app, write_csv):
+    write_csv(**{"Victim.injury": ["Fatal", " INJURED ", np.nan, "unknown", "uninjured"]})
+
+    df = app.build_dataframe()
+
+    # The unknown injury is dropped; a missing injury is kept without a code
+    injuries = df["Victim.injury"].astype(object).where(df["Victim.injury"].notna(), None)
+    codes = df["Victim.injury.num"].fillna(-1).astype(int)
+    assert sorted(zip(codes, injuries)) == [(-1, None), (0, "uninjured"), (1, "injured"), (2, "fatal")]
@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+
+def test_ordered_histograms_keep_their_empty_bins(app, monkeypatch):
+    monkeypatch.setattr(app, "ctx", SimpleNamespace(triggered_id=None))
+    filter_spec = app.get_filter_spec([0, len(app.index_to_date) - 1], ["TAS"], None, None, None, None, None)
+
+    for histogram_type, order in (
+        ("age", app.age_labels),
+        ("month", app.custom_month_order),
+        ("dayofweek", app.custom_day_order),
+    ):
+        bars = app.update_histogram(filter_spec, None, histogram_type, 0, False)["data"][0]
+
+        assert bars["x"] == order
+        assert len(bars["y"]) == len(order)
+
+    # Tasmania has no incidents of victims aged 0-3, which still get a bin
+    age_bars = app.update_histogram(filter_spec, None, "age", 0, False)["data"][0]
+    assert age_bars["y"][0] == 0
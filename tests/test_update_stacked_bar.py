@@ -0,0 +1,12 @@
+from types import SimpleNamespace
+
+
+def test_bar_axis_lists_only_species_with_incidents(app, monkeypatch):
+    monkeypatch.setattr(app, "ctx", SimpleNamespace(triggered_id=None))
+    filter_spec = app.get_filter_spec(
+        [0, len(app.index_to_date) - 1], None, ["white shark"], None, None, None, None
+    )
+
+    figure = app.update_stacked_bar(filter_spec, False)
+
+    assert figure["layout"]["xaxis"]["categoryarray"] == ["white shark"]